@@ -0,0 +1,311 @@
+import json
+import math
+import os
+
+import numpy as np
+
+from langflow.custom.custom_component.component import Component
+from langflow.io import DropdownInput, HandleInput, MessageTextInput, IntInput, Output
+from langflow.schema.dataframe import DataFrame
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class _LocalVectorStore:
+    """Append-only vector collection kept in one directory.
+
+    vectors.bin     normalized row-major vectors (float32 or float16), read via np.memmap
+    payloads.jsonl  one {"page_content", "metadata"} object per row
+    offsets.bin     uint64 byte offset of each payload line
+    ivf_<gen>_*.npy optional inverted-file index over the first ``ivf_count`` rows
+    meta.json       dim, dtype, committed counts and IVF generation; replaced atomically after every write
+    """
+
+    BLOCK_ROWS = 65536
+    SAMPLES_PER_LIST = 32
+    KMEANS_ITERATIONS = 10
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(self._file("meta.json"), encoding="utf-8") as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            self.meta = {
+                "dim": None,
+                "dtype": None,
+                "count": 0,
+                "payload_bytes": 0,
+                "ivf_count": 0,
+                "ivf_lists": 0,
+                "ivf_generation": 0,
+            }
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _ivf_file(self, part: str, generation: int | None = None) -> str:
+        if generation is None:
+            generation = self.meta["ivf_generation"]
+        return self._file(f"ivf_{generation}_{part}.npy")
+
+    def _write_meta(self) -> None:
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file("meta.json"))
+
+    def _truncate(self, name: str, size: int) -> None:
+        # Drops anything an interrupted add() wrote past the committed count
+        path = self._file(name)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    def vectors(self) -> np.ndarray:
+        if not self.count:
+            return np.empty((0, self.meta["dim"] or 0), dtype=np.float32)
+        return np.memmap(
+            self._file("vectors.bin"),
+            dtype=self.meta["dtype"],
+            mode="r",
+            shape=(self.count, self.meta["dim"]),
+        )
+
+    def add(self, vectors, payloads: list[dict], dtype: str = "float32") -> None:
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        if self.meta["dim"] is None:
+            self.meta["dim"] = int(vectors.shape[1])
+            self.meta["dtype"] = dtype
+        elif vectors.shape[1] != self.meta["dim"]:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match the collection ({self.meta['dim']})"
+            )
+
+        os.makedirs(self.path, exist_ok=True)
+        row_bytes = self.meta["dim"] * np.dtype(self.meta["dtype"]).itemsize
+        self._truncate("vectors.bin", self.count * row_bytes)
+        self._truncate("offsets.bin", self.count * 8)
+        self._truncate("payloads.jsonl", self.meta["payload_bytes"])
+
+        with open(self._file("vectors.bin"), "ab") as f:
+            f.write(vectors.astype(self.meta["dtype"]).tobytes())
+
+        offsets = []
+        position = self.meta["payload_bytes"]
+        with open(self._file("payloads.jsonl"), "ab") as f:
+            for payload in payloads:
+                line = (json.dumps(payload, default=str) + "\n").encode("utf-8")
+                offsets.append(position)
+                f.write(line)
+                position += len(line)
+
+        with open(self._file("offsets.bin"), "ab") as f:
+            f.write(np.asarray(offsets, dtype=np.uint64).tobytes())
+
+        self.meta["count"] += len(payloads)
+        self.meta["payload_bytes"] = position
+        self._write_meta()
+
+    def payloads(self, rows) -> list[dict]:
+        offsets = np.memmap(self._file("offsets.bin"), dtype=np.uint64, mode="r", shape=(self.count,))
+        results = []
+        with open(self._file("payloads.jsonl"), "rb") as f:
+            for row in rows:
+                f.seek(int(offsets[row]))
+                results.append(json.loads(f.readline()))
+        return results
+
+    def search(self, query, k: int, n_probe: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return (rows, scores) of the k nearest vectors by cosine similarity."""
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        vectors = self.vectors()
+
+        if self.meta["ivf_count"]:
+            centroids = np.load(self._ivf_file("centroids"))
+            rows = np.load(self._ivf_file("rows"), mmap_mode="r")
+            bounds = np.load(self._ivf_file("bounds"))
+            probed = _top_k(centroids @ query, max(n_probe, 1))
+            candidates = np.concatenate(
+                [rows[bounds[c] : bounds[c + 1]] for c in probed]
+                # Rows appended after the index was built are always scanned
+                + [np.arange(self.meta["ivf_count"], self.count)]
+            )
+            candidates.sort()  # sequential memmap reads
+            scores = np.asarray(vectors[candidates], dtype=np.float32) @ query
+            top = _top_k(scores, k)
+            return candidates[top], scores[top]
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, self.count, self.BLOCK_ROWS):
+            scores = np.asarray(vectors[start : start + self.BLOCK_ROWS], dtype=np.float32) @ query
+            top = _top_k(scores, k)
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            keep = _top_k(best_scores, k)
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+        return best_rows, best_scores
+
+    def build_ivf(self, seed: int = 0) -> None:
+        """Spherical k-means over a sample, then assign every row to its nearest list."""
+        vectors = self.vectors()
+        n_lists = max(int(math.sqrt(self.count)), 1)
+        rng = np.random.default_rng(seed)
+
+        sample_rows = np.sort(rng.choice(self.count, size=min(self.count, n_lists * self.SAMPLES_PER_LIST), replace=False))
+        sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(self.KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        assignment = np.concatenate(
+            [
+                np.argmax(np.asarray(vectors[start : start + self.BLOCK_ROWS], dtype=np.float32) @ centroids.T, axis=1)
+                for start in range(0, self.count, self.BLOCK_ROWS)
+            ]
+        )
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+
+        # Each build gets new file names, completed via os.replace before meta.json
+        # points at them, so a reader never loads a half-written index
+        previous = self.meta["ivf_generation"]
+        generation = previous + 1
+        for part, array in (
+            ("centroids", centroids),
+            ("rows", order.astype(np.int64)),
+            ("bounds", bounds.astype(np.int64)),
+        ):
+            path = self._ivf_file(part, generation)
+            with open(f"{path}.tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(f"{path}.tmp", path)
+
+        self.meta.update(ivf_count=self.count, ivf_lists=n_lists, ivf_generation=generation)
+        self._write_meta()
+
+        # The previous build stays for readers still holding the old meta.json
+        for part in ("centroids", "rows", "bounds"):
+            stale = self._ivf_file(part, previous - 1)
+            if os.path.exists(stale):
+                os.remove(stale)
+
+
+class LocalVectorIndex(Component):
+    display_name = "Local Vector Index"
+    description = "Stores embeddings in a memory-mapped local index (no server)."
+    icon = "database-2-line"
+    name = "LocalVectorIndex"
+
+    inputs = [
+        HandleInput(
+            name="data_inputs",
+            display_name="Chunks",
+            input_types=["DataFrame"],
+            required=True,
+        ),
+        HandleInput(
+            name="embeddings",
+            display_name="Embeddings",
+            input_types=["Embeddings"],
+            required=True,
+        ),
+        MessageTextInput(
+            name="index_path",
+            display_name="Index Directory",
+            value="./vector_index",
+            required=True,
+        ),
+        MessageTextInput(
+            name="collection_name",
+            display_name="Collection Name",
+            required=True,
+        ),
+        IntInput(
+            name="batch_size",
+            display_name="Batch Size",
+            value=64,
+        ),
+        DropdownInput(
+            name="vector_dtype",
+            display_name="Vector Precision",
+            options=["float32", "float16"],
+            value="float32",
+            info="float16 halves disk and page-cache use at a small cost in score precision.",
+            advanced=True,
+        ),
+        IntInput(
+            name="ann_threshold",
+            display_name="ANN Threshold",
+            info="Build an approximate (IVF) index once the collection holds this many vectors. "
+            "Search then trades recall for speed; tune Lists to Probe. 0 = always exact.",
+            value=0,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(
+            display_name="Indexed Data",
+            name="dataframe",
+            method="index_data",
+        )
+    ]
+
+    def _store(self) -> _LocalVectorStore:
+        return _LocalVectorStore(os.path.join(self.index_path, self.collection_name))
+
+    def index_data(self) -> DataFrame:
+        if not isinstance(self.data_inputs, DataFrame):
+            raise TypeError("Input must be a DataFrame")
+
+        if not len(self.data_inputs):
+            raise TypeError("Input DataFrame is empty")
+
+        documents = self.data_inputs.to_lc_documents()
+        store = self._store()
+
+        batch_size = max(self.batch_size, 1)
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start : start + batch_size]
+            vectors = self.embeddings.embed_documents([doc.page_content for doc in batch])
+            store.add(
+                vectors,
+                [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in batch],
+                dtype=self.vector_dtype,
+            )
+
+        # Rebuild once the rows outside the IVF index reach 10% of the collection
+        unindexed = store.count - store.meta["ivf_count"]
+        if self.ann_threshold and store.count >= self.ann_threshold and unindexed * 10 >= store.count:
+            store.build_ivf()
+
+        self.status = f"Indexed {len(documents)} chunks ({store.count} in collection)"
+        if store.meta["ivf_count"]:
+            self.status += f", approximate search over {store.meta['ivf_lists']} IVF lists"
+
+        # Pass-through
+        return self.data_inputs
\ No newline at end of file
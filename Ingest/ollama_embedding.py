@@ -1,9 +1,6 @@
 from typing import Any
 from urllib.parse import urljoin
 
-import httpx
-from langchain_community.embeddings import OllamaEmbeddings
-
 from langflow.base.models.model import LCModelComponent
 from langflow.base.models.ollama_constants import URL_LIST
 from langflow.field_typing import Embeddings
@@ -47,6 +44,8 @@ class OllamaEmbeddingsComponent(LCModelComponent):
     ]
 
     def build_embeddings(self) -> Embeddings:
+        from langchain_community.embeddings import OllamaEmbeddings
+
         try:
             return OllamaEmbeddings(
                 model=self.model_name,
@@ -97,6 +96,8 @@ class OllamaEmbeddingsComponent(LCModelComponent):
 
     async def get_models(self, base_url_value: str) -> list[str]:
         """Get ALL model names from Ollama."""
+        import httpx
+
         try:
             url = urljoin(base_url_value, "/api/tags")
             async with httpx.AsyncClient() as client:
@@ -114,6 +115,8 @@ class OllamaEmbeddingsComponent(LCModelComponent):
             raise ValueError("Could not get model names from Ollama.") from e
 
     async def is_valid_ollama_url(self, url: str) -> bool:
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"{url}/api/tags")
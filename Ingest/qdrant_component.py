@@ -1,8 +1,118 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+import types
+import uuid
+import weakref
+from typing import TYPE_CHECKING
+
 from langflow.custom.custom_component.component import Component
-from langflow.io import HandleInput, MessageTextInput, IntInput, Output
+from langflow.io import BoolInput, FloatInput, HandleInput, MessageTextInput, IntInput, Output
 from langflow.schema.dataframe import DataFrame
 
-from langchain_community.vectorstores import Qdrant
+# qdrant_client is imported where it is used, so loading the component palette
+# does not pay for it
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import PointStruct
+
+
+class _AdaptiveBatchSizer:
+    """Batch size controller: grows towards a latency target, halves on errors.
+
+    With ``target_seconds=None`` the size is fixed and the first error is fatal,
+    which matches the behaviour of a plain ``batch_size``.
+    """
+
+    SMOOTHING = 0.3
+    MAX_ERROR_RATE = 0.05
+
+    def __init__(self, initial, minimum, maximum, target_seconds=None, max_bytes=None, retries=2):
+        self.minimum = max(int(minimum), 1)
+        self.maximum = max(int(maximum), self.minimum)
+        self.size = self._clamp(initial)
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.retries = retries if target_seconds is not None else 0
+        self.error_rate = 0.0
+        self._seconds_per_item = None
+        self._bytes_per_item = None
+        self._errors_at_minimum = 0
+
+    def _clamp(self, size) -> int:
+        return min(max(int(size), self.minimum), self.maximum)
+
+    def _smooth(self, previous, observed):
+        if previous is None:
+            return observed
+        return previous + self.SMOOTHING * (observed - previous)
+
+    def record_success(self, count: int, seconds: float, nbytes: int = 0) -> None:
+        self._errors_at_minimum = 0
+        self.error_rate *= 1 - self.SMOOTHING
+        if self.target_seconds is None or count <= 0:
+            return
+
+        self._seconds_per_item = self._smooth(self._seconds_per_item, max(seconds, 1e-6) / count)
+        target = self.target_seconds / self._seconds_per_item
+
+        if nbytes and self.max_bytes:
+            self._bytes_per_item = self._smooth(self._bytes_per_item, nbytes / count)
+            target = min(target, self.max_bytes / self._bytes_per_item)
+
+        # Never grow while recent errors are still weighing on the rate
+        if self.error_rate > self.MAX_ERROR_RATE:
+            target = min(target, self.size)
+
+        self.size = self._clamp(min(target, self.size * 2))
+
+    def record_error(self) -> bool:
+        """Shrink after a failure. Returns False once retrying is pointless."""
+        self.error_rate += self.SMOOTHING * (1 - self.error_rate)
+        if self.size > self.minimum:
+            self.size = self._clamp(self.size // 2)
+            return True
+        # Only failures at the minimum size use up the retries
+        self._errors_at_minimum += 1
+        return self._errors_at_minimum <= self.retries
+
+
+def _process_state() -> types.ModuleType:
+    """Holder for state shared by every build of this component in the process.
+
+    Langflow executes custom component code afresh for every build, so module
+    globals are not shared between runs; the holder is registered in sys.modules.
+    """
+    name = "_qdrant_http_only_state"
+    return sys.modules.setdefault(name, types.ModuleType(name))
+
+
+async def _shared_async_client(url: str) -> "AsyncQdrantClient":
+    """One AsyncQdrantClient per URL and event loop, so connections are reused.
+
+    Construction runs in a worker thread because qdrant-client may check the
+    server version synchronously while building a client.
+    """
+    from qdrant_client import AsyncQdrantClient
+
+    loop = asyncio.get_running_loop()
+    clients = vars(_process_state()).setdefault("async_clients", {})
+    # Loops that have been closed, e.g. by index_data's asyncio.run, leave stale entries
+    for stale in [key for key, (ref, _) in clients.items() if ref() is None]:
+        clients.pop(stale, None)
+    key = (url, id(loop))
+    entry = clients.get(key)
+    if entry is None or entry[0]() is not loop:
+        client = await asyncio.to_thread(AsyncQdrantClient, url=url)
+        entry = clients.get(key)
+        if entry is None or entry[0]() is not loop:
+            entry = clients[key] = (weakref.ref(loop), client)
+        else:
+            await client.close()
+    return entry[1]
 
 
 class QdrantHTTPOnly(Component):
@@ -40,17 +150,62 @@ class QdrantHTTPOnly(Component):
             display_name="Batch Size",
             value=64,
         ),
+        MessageTextInput(
+            name="checkpoint_path",
+            display_name="Checkpoint File",
+            info="Optional JSONL file. Each batch is recorded after Qdrant acknowledges the upsert, "
+            "and recorded chunks are skipped on the next run.",
+            required=False,
+            advanced=True,
+        ),
+        BoolInput(
+            name="adaptive_batching",
+            display_name="Adaptive Batching",
+            info="Tune embedding and upsert batch sizes at runtime from observed latency, "
+            "errors and payload size. Batch Size is used as the starting point.",
+            value=False,
+            advanced=True,
+        ),
+        IntInput(
+            name="min_batch_size",
+            display_name="Min Batch Size",
+            value=8,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_batch_size",
+            display_name="Max Batch Size",
+            value=512,
+            advanced=True,
+        ),
+        FloatInput(
+            name="target_batch_seconds",
+            display_name="Target Seconds per Batch",
+            value=2.0,
+            advanced=True,
+        ),
+        FloatInput(
+            name="max_upsert_mb",
+            display_name="Max Upsert Payload (MB)",
+            value=8.0,
+            advanced=True,
+        ),
     ]
 
     outputs = [
         Output(
             display_name="Indexed Data",
             name="dataframe",
-            method="index_data",
+            method="aindex_data",
         )
     ]
 
     def index_data(self) -> DataFrame:
+        """Sync entry point for direct callers; runs aindex_data on its own event loop."""
+        return asyncio.run(self.aindex_data())
+
+    async def aindex_data(self) -> DataFrame:
+        """Embed and upsert the chunks without blocking the event loop."""
         if not isinstance(self.data_inputs, DataFrame):
             raise TypeError("Input must be a DataFrame")
 
@@ -59,14 +214,228 @@ class QdrantHTTPOnly(Component):
 
         documents = self.data_inputs.to_lc_documents()
 
-        # ✅ CORRECT API FOR THIS LANGCHAIN VERSION
-        Qdrant.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            url=self.qdrant_url,
-            collection_name=self.collection_name,
-            batch_size=self.batch_size,
-        )
+        if self.checkpoint_path:
+            pending, record_batch = self._checkpoint_plan(documents)
+            await self._aindex_batches(pending, on_batch=record_batch)
+            self.status = f"{self.status}, skipped {len(documents) - len(pending)} already checkpointed"
+            return self.data_inputs
+
+        # Batch Size is used as-is unless adaptive batching is on
+        await self._aindex_batches([(str(uuid.uuid4()), None, doc) for doc in documents])
 
         # Pass-through
-        return self.data_inputs
\ No newline at end of file
+        return self.data_inputs
+
+    def _checkpoint_plan(self, documents) -> tuple[list, object]:
+        """Chunks still to upsert, plus a callback recording each stored batch.
+
+        Point IDs are derived from (bucket, key, page, chunk ordinal, content hash),
+        so a batch that is replayed after a crash overwrites its points instead of
+        duplicating them, and different chunks never share an ID. Finished pages
+        are recorded as (bucket, key, etag, page), so a PDF replaced in S3 is
+        loaded again.
+        """
+        done_ids = self._load_checkpoint_ids()
+
+        pending = []
+        ordinals: dict[tuple, int] = {}
+        for doc in documents:
+            page_key = (
+                doc.metadata.get("bucket"),
+                doc.metadata.get("key"),
+                doc.metadata.get("etag"),
+                doc.metadata.get("page"),
+            )
+            ordinal = ordinals.get(page_key, 0)
+            ordinals[page_key] = ordinal + 1
+
+            # Inputs without S3 metadata all share one page key; the hash keeps them apart
+            digest = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+            point_id = str(
+                uuid.uuid5(
+                    uuid.NAMESPACE_URL,
+                    f"{self.collection_name}/{page_key[0]}/{page_key[1]}#{page_key[3]}:{ordinal}:{digest}",
+                )
+            )
+            if point_id not in done_ids:
+                pending.append((point_id, page_key, doc))
+
+        # A page is complete once the batch holding its last pending chunk is stored
+        last_position = {page_key: i for i, (_, page_key, _) in enumerate(pending)}
+
+        # Pages whose chunks were all stored earlier (e.g. unchanged text in a
+        # replaced PDF) are recorded now, or the loader would keep sending them
+        already_stored = [
+            list(page_key)
+            for page_key in ordinals
+            if page_key[1] is not None and page_key not in last_position
+        ]
+        if already_stored:
+            self._append_checkpoint({"collection": self.collection_name, "ids": [], "pages": already_stored})
+
+        def record_batch(batch_number: int, start: int, batch: list) -> None:
+            end = start + len(batch)
+            finished_pages = dict.fromkeys(
+                page_key
+                for _, page_key, _ in batch
+                if page_key[1] is not None and last_position[page_key] < end
+            )
+            self._append_checkpoint(
+                {
+                    "collection": self.collection_name,
+                    "batch": batch_number,
+                    "ids": [point_id for point_id, _, _ in batch],
+                    "pages": [list(page_key) for page_key in finished_pages],
+                }
+            )
+
+        return pending, record_batch
+
+    def _make_sizer(self, max_bytes=None) -> _AdaptiveBatchSizer:
+        if not self.adaptive_batching:
+            return _AdaptiveBatchSizer(self.batch_size, self.batch_size, self.batch_size)
+        return _AdaptiveBatchSizer(
+            self.batch_size,
+            self.min_batch_size,
+            self.max_batch_size,
+            target_seconds=self.target_batch_seconds,
+            max_bytes=max_bytes,
+        )
+
+    async def _aattempt(self, sizer: _AdaptiveBatchSizer, count: int, fn, nbytes: int = 0):
+        """Run one timed batch call. Returns None when the batch should be retried smaller."""
+        started = time.perf_counter()
+        try:
+            result = await fn()
+        except Exception as e:
+            if not sizer.record_error():
+                raise
+            self.log(f"Batch of {count} failed ({e!r}); retrying with batch size {sizer.size}")
+            return None
+        sizer.record_success(count, time.perf_counter() - started, nbytes)
+        return result
+
+    def _to_points(self, chunk: list, vectors) -> "list[PointStruct]":
+        from qdrant_client.models import PointStruct
+
+        return [
+            PointStruct(
+                id=point_id,
+                vector=vector,
+                payload={"page_content": doc.page_content, "metadata": doc.metadata},
+            )
+            for (point_id, _, doc), vector in zip(chunk, vectors)
+        ]
+
+    @staticmethod
+    def _payload_bytes(points: "list[PointStruct]") -> int:
+        return sum(len(json.dumps(p.payload, default=str)) + 4 * len(p.vector) for p in points)
+
+    async def _aindex_batches(self, pending: list, on_batch=None) -> None:
+        """Embed and upsert ``(point_id, page_key, document)`` items.
+
+        Embedding and upsert run as separate stages with their own batch size, so
+        a slow Ollama host and a payload-limited Qdrant are tuned independently.
+        ``on_batch(batch_number, start, batch)`` runs after each acknowledged upsert.
+        """
+        client = await self._async_qdrant_client()
+        embed_sizer = self._make_sizer()
+        upsert_sizer = self._make_sizer(max_bytes=int(self.max_upsert_mb * 1024 * 1024))
+
+        ready: list[PointStruct] = []
+        embedded = 0
+        stored = 0
+        batch_number = 0
+        while stored < len(pending):
+            while embedded < len(pending) and len(ready) < upsert_sizer.size:
+                chunk = pending[embedded : embedded + embed_sizer.size]
+                texts = [doc.page_content for _, _, doc in chunk]
+                vectors = await self._aattempt(
+                    embed_sizer, len(chunk), lambda: self.embeddings.aembed_documents(texts)
+                )
+                if vectors is None:
+                    continue
+
+                if not embedded and not stored:
+                    await self._aensure_collection(client, len(vectors[0]))
+                ready.extend(self._to_points(chunk, vectors))
+                embedded += len(chunk)
+
+            points = ready[: upsert_sizer.size]
+            acknowledged = await self._aattempt(
+                upsert_sizer,
+                len(points),
+                lambda: client.upsert(collection_name=self.collection_name, points=points, wait=True),
+                self._payload_bytes(points),
+            )
+            if acknowledged is None:
+                continue
+
+            if on_batch is not None:
+                on_batch(batch_number, stored, pending[stored : stored + len(points)])
+            ready = ready[len(points) :]
+            stored += len(points)
+            batch_number += 1
+
+        self.status = (
+            f"Indexed {stored} chunks in {batch_number} batches "
+            f"(embed batch size {embed_sizer.size}, upsert batch size {upsert_sizer.size})"
+        )
+
+    async def _async_qdrant_client(self) -> "AsyncQdrantClient":
+        # Single construction point, so a harness can substitute a shared client
+        return await _shared_async_client(self.qdrant_url)
+
+    async def _aensure_collection(self, client: "AsyncQdrantClient", dimension: int) -> None:
+        from qdrant_client.models import Distance, VectorParams
+
+        # Same vector layout and distance as Qdrant.from_documents, so retrieval is unchanged
+        if not await client.collection_exists(self.collection_name):
+            await client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=dimension, distance=Distance.COSINE),
+            )
+            return
+
+        # Checked before the first upsert, so a model switch is not retried as a batch error
+        info = await client.get_collection(self.collection_name)
+        params = info.config.params.vectors
+        if not isinstance(params, VectorParams):
+            raise ValueError(
+                f"Collection '{self.collection_name}' uses named vectors; "
+                "this component writes a single unnamed vector"
+            )
+        if params.size != dimension:
+            raise ValueError(
+                f"Collection '{self.collection_name}' holds {params.size}-dimensional vectors, "
+                f"but the embedding model produces {dimension}. "
+                "Use the model the collection was built with, or a new collection."
+            )
+        if params.distance != Distance.COSINE:
+            raise ValueError(
+                f"Collection '{self.collection_name}' uses {Distance(params.distance).value} distance; "
+                "this component requires Cosine"
+            )
+
+    def _load_checkpoint_ids(self) -> set[str]:
+        done_ids: set[str] = set()
+        if not os.path.exists(self.checkpoint_path):
+            return done_ids
+
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be truncated if the previous run died mid-write
+                    continue
+                if record.get("collection") == self.collection_name:
+                    done_ids.update(record.get("ids", []))
+
+        return done_ids
+
+    def _append_checkpoint(self, record: dict) -> None:
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
\ No newline at end of file
@@ -1,14 +1,19 @@
+import hashlib
+import json
 import os
 import tempfile
-
-import boto3
-from langchain.document_loaders import PyPDFLoader
+from typing import TYPE_CHECKING
 
 from langflow.custom.custom_component.component import Component
 from langflow.io import MessageTextInput, SecretStrInput, IntInput, Output
 from langflow.schema.data import Data
 from langflow.schema.dataframe import DataFrame
 
+# boto3 and the PDF loader are imported inside load_documents, so loading the
+# component palette does not pay for them
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
 
 class CloudianS3LoadPDFs(Component):
     display_name = "Cloudian S3 Load PDFs from Folder"
@@ -24,6 +29,29 @@ class CloudianS3LoadPDFs(Component):
         MessageTextInput(name="folder_prefix", display_name="Folder / Prefix", required=True),
         IntInput(name="start_page", display_name="Start Page (1-based)", value=1),
         IntInput(name="pages_per_batch", display_name="Pages per Batch (0 = all)", value=0),
+        MessageTextInput(
+            name="checkpoint_path",
+            display_name="Checkpoint File",
+            info="JSONL checkpoint written by the Qdrant component. Pages recorded there are skipped, "
+            "so a restarted run resumes at the first incomplete page. A PDF replaced in S3 is indexed again.",
+            required=False,
+            advanced=True,
+        ),
+        MessageTextInput(
+            name="collection_name",
+            display_name="Checkpoint Collection",
+            info="Qdrant collection the checkpoint is read for. Required with a checkpoint file.",
+            required=False,
+            advanced=True,
+        ),
+        MessageTextInput(
+            name="page_cache_dir",
+            display_name="Page Text Cache Directory",
+            info="Optional. Extracted page text is stored here as Parquet, keyed by bucket, key and ETag, "
+            "so unchanged PDFs are not downloaded or parsed again.",
+            required=False,
+            advanced=True,
+        ),
     ]
 
     outputs = [
@@ -31,6 +59,8 @@ class CloudianS3LoadPDFs(Component):
     ]
 
     def load_documents(self) -> DataFrame:
+        import boto3
+
         s3 = boto3.client(
             "s3",
             endpoint_url=self.s3_endpoint,
@@ -47,39 +77,183 @@ class CloudianS3LoadPDFs(Component):
 
         start_index = max(self.start_page - 1, 0)
         max_pages = self.pages_per_batch if self.pages_per_batch > 0 else None
+        completed, manifests = self._load_checkpoint()
+        finished_objects = 0
 
         for obj in response.get("Contents", []):
             key = obj["Key"]
             if not key.lower().endswith(".pdf"):
                 continue
 
-            with tempfile.TemporaryDirectory() as tmp:
-                local_path = os.path.join(tmp, os.path.basename(key))
-                s3.download_file(self.bucket_name, key, local_path)
-
-                loader = PyPDFLoader(local_path)
-                pages = loader.load()  # one Document per page
-
-                if max_pages is not None:
-                    pages = pages[start_index : start_index + max_pages]
-                else:
-                    pages = pages[start_index:]
-
-                for page_number, doc in enumerate(pages, start=start_index + 1):
-                    if not doc.page_content.strip():
-                        continue
-
-                    data_items.append(
-                        Data(
-                            text=doc.page_content,
-                            data={
-                                **doc.metadata,
-                                "bucket": self.bucket_name,
-                                "key": key,
-                                "endpoint": self.s3_endpoint,
-                                "page": page_number,
-                            },
-                        )
+            etag = obj.get("ETag", "")
+            if self.checkpoint_path and self._object_finished(key, etag, completed, manifests):
+                finished_objects += 1
+                continue
+
+            pages = self._read_page_cache(key, etag)
+            if pages is None:
+                pages = self._extract_pages(s3, key)
+                self._write_page_cache(key, etag, pages)
+
+            numbered = list(enumerate(pages, start=1))[start_index:]
+
+            # Resume: drop pages already upserted, and empty pages so they
+            # never count against the batch (they are never checkpointed)
+            if self.checkpoint_path:
+                if etag and (self.bucket_name, key, etag) not in manifests:
+                    self._record_manifest(key, etag, pages)
+                numbered = [
+                    (page_number, doc)
+                    for page_number, doc in numbered
+                    if doc.page_content.strip()
+                    and (self.bucket_name, key, etag, page_number) not in completed
+                ]
+
+            if max_pages is not None:
+                numbered = numbered[:max_pages]
+
+            for page_number, doc in numbered:
+                if not doc.page_content.strip():
+                    continue
+
+                data_items.append(
+                    Data(
+                        text=doc.page_content,
+                        data={
+                            **doc.metadata,
+                            "bucket": self.bucket_name,
+                            "key": key,
+                            "etag": etag,
+                            "endpoint": self.s3_endpoint,
+                            "page": page_number,
+                        },
                     )
+                )
+
+        if self.checkpoint_path and not data_items:
+            # Nothing left to index; stop here rather than hand the splitter an empty DataFrame
+            self.status = f"All pages already checkpointed ({finished_objects} PDFs skipped)"
+            self.stop("dataframe")
+
+        return DataFrame(data_items)
+
+    def _extract_pages(self, s3, key: str) -> "list[Document]":
+        from langchain.document_loaders import PyPDFLoader
+
+        with tempfile.TemporaryDirectory() as tmp:
+            local_path = os.path.join(tmp, os.path.basename(key))
+            s3.download_file(self.bucket_name, key, local_path)
+
+            loader = PyPDFLoader(local_path)
+            return loader.load()  # one Document per page
+
+    def _page_cache_file(self, key: str, etag: str) -> str:
+        digest = hashlib.sha1(f"{self.bucket_name}\0{key}\0{etag}".encode("utf-8")).hexdigest()
+        return os.path.join(self.page_cache_dir, f"{digest}.parquet")
+
+    def _read_page_cache(self, key: str, etag: str) -> "list[Document] | None":
+        """Pages of an unchanged object, or None on a miss (or when caching is off)."""
+        if not self.page_cache_dir or not etag:
+            return None
+
+        path = self._page_cache_file(key, etag)
+        if not os.path.exists(path):
+            return None
+
+        import pyarrow.parquet as pq
+        from langchain_core.documents import Document
+
+        table = pq.read_table(path, columns=["page", "text", "metadata"]).sort_by("page")
+        return [
+            Document(page_content=row["text"], metadata=json.loads(row["metadata"]))
+            for row in table.to_pylist()
+        ]
+
+    def _write_page_cache(self, key: str, etag: str, pages: "list[Document]") -> None:
+        if not self.page_cache_dir or not etag:
+            return
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ValueError(
+                "The page text cache requires pyarrow. Install it or clear the Page Text Cache Directory setting."
+            ) from e
+
+        # Empty pages are kept so page numbers stay aligned with the PDF
+        table = pa.table(
+            {
+                "bucket": [self.bucket_name] * len(pages),
+                "key": [key] * len(pages),
+                "etag": [etag] * len(pages),
+                "page": list(range(1, len(pages) + 1)),
+                "text": [doc.page_content for doc in pages],
+                "metadata": [json.dumps(doc.metadata, default=str) for doc in pages],
+            }
+        )
+
+        os.makedirs(self.page_cache_dir, exist_ok=True)
+        path = self._page_cache_file(key, etag)
+        pq.write_table(table, f"{path}.tmp", compression="zstd")
+        os.replace(f"{path}.tmp", path)
+
+    def _load_checkpoint(self) -> tuple[set[tuple], dict[tuple, list[int]]]:
+        """Read the checkpoint for this collection.
+
+        Returns the (bucket, key, etag, page) entries recorded as fully upserted,
+        and the non-empty page numbers of every (bucket, key, etag) object seen.
+        """
+        completed: set[tuple] = set()
+        manifests: dict[tuple, list[int]] = {}
+        if not self.checkpoint_path:
+            return completed, manifests
+
+        if not self.collection_name:
+            raise ValueError("A checkpoint file needs the Qdrant collection name it was written for")
+
+        if not os.path.exists(self.checkpoint_path):
+            return completed, manifests
+
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be truncated if the previous run died mid-write
+                    continue
+                if record.get("collection") != self.collection_name:
+                    continue
+                # Entries without an ETag predate versioned checkpoints and are re-checked
+                for entry in record.get("pages", []):
+                    if len(entry) == 4:
+                        completed.add(tuple(entry))
+                manifest = record.get("manifest")
+                if manifest:
+                    manifests[(manifest["bucket"], manifest["key"], manifest["etag"])] = manifest["pages"]
+
+        return completed, manifests
+
+    def _object_finished(self, key: str, etag: str, completed: set[tuple], manifests: dict) -> bool:
+        """True when every non-empty page of this object version from Start Page on is upserted."""
+        pages = manifests.get((self.bucket_name, key, etag)) if etag else None
+        if pages is None:
+            return False
+        return all(
+            (self.bucket_name, key, etag, page) in completed
+            for page in pages
+            if page >= self.start_page
+        )
 
-        return DataFrame(data_items)
\ No newline at end of file
+    def _record_manifest(self, key: str, etag: str, pages: "list[Document]") -> None:
+        # Lets later runs tell a finished PDF apart without downloading it
+        manifest = {
+            "bucket": self.bucket_name,
+            "key": key,
+            "etag": etag,
+            "pages": [number for number, doc in enumerate(pages, start=1) if doc.page_content.strip()],
+        }
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"collection": self.collection_name, "manifest": manifest}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -1,9 +1,6 @@
 import os
 import tempfile
 
-import boto3
-from langchain.document_loaders import PyPDFLoader
-
 from langflow.custom.custom_component.component import Component
 from langflow.io import MessageTextInput, SecretStrInput, Output
 from langflow.schema.data import Data
@@ -29,6 +26,9 @@ class CloudianS3LoadPDFs(Component):
     ]
 
     def load_documents(self) -> DataFrame:
+        import boto3
+        from langchain.document_loaders import PyPDFLoader
+
         s3 = boto3.client(
             "s3",
             endpoint_url=self.s3_endpoint,
@@ -1,5 +1,3 @@
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
 from langflow.custom.custom_component.component import Component
 from langflow.io import HandleInput, IntInput, MessageTextInput, Output
 from langflow.schema.data import Data
@@ -51,6 +49,8 @@ class SplitDocumentsRAG(Component):
         return [Data(text=doc.page_content, data=doc.metadata) for doc in docs]
 
     def split_documents_base(self):
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+
         separator = unescape_string(self.separator)
 
         # ---- Convert LangFlow input → LangChain Documents ----
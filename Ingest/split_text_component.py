@@ -1,5 +1,3 @@
-from langchain_text_splitters import CharacterTextSplitter
-
 from langflow.custom.custom_component.component import Component
 from langflow.io import HandleInput, IntInput, MessageTextInput, Output
 from langflow.schema.data import Data
@@ -52,6 +50,8 @@ class SplitTextCustom(Component):
         return [Data(text=doc.page_content, data=doc.metadata) for doc in docs]
 
     def split_text_base(self):
+        from langchain_text_splitters import CharacterTextSplitter
+
         separator = unescape_string(self.separator)
 
         # ---- Convert input → LangChain Documents ----
@@ -1,10 +1,218 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import types
+import uuid
+import weakref
+from typing import TYPE_CHECKING
+
 from langflow.custom.custom_component.component import Component
-from langflow.io import HandleInput, MessageTextInput, IntInput, Output
+from langflow.io import BoolInput, FloatInput, HandleInput, MessageTextInput, IntInput, Output
 from langflow.schema.dataframe import DataFrame
 from langflow.schema.data import Data
 
-from langchain_community.vectorstores import Qdrant
-from qdrant_client import QdrantClient
+# langchain_community and qdrant_client are imported where they are used, so
+# loading the component palette does not pay for them
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient, QdrantClient
+    from qdrant_client.models import PointStruct
+
+
+class _AdaptiveBatchSizer:
+    """Batch size controller: grows towards a latency target, halves on errors.
+
+    With ``target_seconds=None`` the size is fixed and the first error is fatal,
+    which matches the behaviour of a plain ``batch_size``.
+    """
+
+    SMOOTHING = 0.3
+    MAX_ERROR_RATE = 0.05
+
+    def __init__(self, initial, minimum, maximum, target_seconds=None, max_bytes=None, retries=2):
+        self.minimum = max(int(minimum), 1)
+        self.maximum = max(int(maximum), self.minimum)
+        self.size = self._clamp(initial)
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.retries = retries if target_seconds is not None else 0
+        self.error_rate = 0.0
+        self._seconds_per_item = None
+        self._bytes_per_item = None
+        self._errors_at_minimum = 0
+
+    def _clamp(self, size) -> int:
+        return min(max(int(size), self.minimum), self.maximum)
+
+    def _smooth(self, previous, observed):
+        if previous is None:
+            return observed
+        return previous + self.SMOOTHING * (observed - previous)
+
+    def record_success(self, count: int, seconds: float, nbytes: int = 0) -> None:
+        self._errors_at_minimum = 0
+        self.error_rate *= 1 - self.SMOOTHING
+        if self.target_seconds is None or count <= 0:
+            return
+
+        self._seconds_per_item = self._smooth(self._seconds_per_item, max(seconds, 1e-6) / count)
+        target = self.target_seconds / self._seconds_per_item
+
+        if nbytes and self.max_bytes:
+            self._bytes_per_item = self._smooth(self._bytes_per_item, nbytes / count)
+            target = min(target, self.max_bytes / self._bytes_per_item)
+
+        # Never grow while recent errors are still weighing on the rate
+        if self.error_rate > self.MAX_ERROR_RATE:
+            target = min(target, self.size)
+
+        self.size = self._clamp(min(target, self.size * 2))
+
+    def record_error(self) -> bool:
+        """Shrink after a failure. Returns False once retrying is pointless."""
+        self.error_rate += self.SMOOTHING * (1 - self.error_rate)
+        if self.size > self.minimum:
+            self.size = self._clamp(self.size // 2)
+            return True
+        # Only failures at the minimum size use up the retries
+        self._errors_at_minimum += 1
+        return self._errors_at_minimum <= self.retries
+
+
+class _SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self._futures: dict = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _join(self, table: dict, key, create):
+        with self._lock:
+            call = table.get(key)
+            if call is not None:
+                self.followers += 1
+                return call, False
+            table[key] = call = create()
+            self.leaders += 1
+            return call, True
+
+    def do(self, key, fn):
+        call, leader = self._join(self._calls, key, lambda: {"done": threading.Event()})
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+    async def ado(self, key, fn):
+        loop = asyncio.get_running_loop()
+        # Futures cannot be awaited across event loops
+        key = (id(loop), key)
+        future, leader = self._join(self._futures, key, loop.create_future)
+        if not leader:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader was cancelled, not us: run the call ourselves
+                    return await self.ado(key[1], fn)
+                raise
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+    def stats(self) -> dict:
+        total = self.leaders + self.followers
+        return {
+            "requests": total,
+            "executed": self.leaders,
+            "coalesced": self.followers,
+            "coalescing_ratio": self.followers / total if total else 0.0,
+        }
+
+
+def _process_state() -> types.ModuleType:
+    """Holder for state shared by every build of this component in the process.
+
+    Langflow executes custom component code afresh for every build, so module
+    globals are not shared between runs; the holder is registered in sys.modules.
+    """
+    name = "_qdrant_http_only_state"
+    return sys.modules.setdefault(name, types.ModuleType(name))
+
+
+async def _shared_async_client(url: str) -> "AsyncQdrantClient":
+    """One AsyncQdrantClient per URL and event loop, so connections are reused.
+
+    Construction runs in a worker thread because qdrant-client may check the
+    server version synchronously while building a client.
+    """
+    from qdrant_client import AsyncQdrantClient
+
+    loop = asyncio.get_running_loop()
+    clients = vars(_process_state()).setdefault("async_clients", {})
+    # Loops that have been closed, e.g. by index_data's asyncio.run, leave stale entries
+    for stale in [key for key, (ref, _) in clients.items() if ref() is None]:
+        clients.pop(stale, None)
+    key = (url, id(loop))
+    entry = clients.get(key)
+    if entry is None or entry[0]() is not loop:
+        client = await asyncio.to_thread(AsyncQdrantClient, url=url)
+        entry = clients.get(key)
+        if entry is None or entry[0]() is not loop:
+            entry = clients[key] = (weakref.ref(loop), client)
+        else:
+            await client.close()
+    return entry[1]
+
+
+def _shared_client(url: str) -> "QdrantClient":
+    """One QdrantClient per URL, reused by every sync retrieval."""
+    from qdrant_client import QdrantClient
+
+    clients = vars(_process_state()).setdefault("clients", {})
+    client = clients.get(url)
+    if client is None:
+        client = clients.setdefault(url, QdrantClient(url=url))
+    return client
+
+
+def _single_flight() -> _SingleFlight:
+    """Process-wide coalescing table."""
+    state = _process_state()
+    if not hasattr(state, "flight"):
+        state.flight = _SingleFlight()
+    return state.flight
 
 
 class QdrantHTTPOnly(Component):
@@ -52,25 +260,78 @@ class QdrantHTTPOnly(Component):
             display_name="Number of Results (k)",
             value=4,
         ),
+        BoolInput(
+            name="coalesce_requests",
+            display_name="Coalesce Identical Searches",
+            info="Concurrent searches for the same query, collection and k share one embedding "
+            "and one Qdrant search.",
+            value=True,
+            advanced=True,
+        ),
+        MessageTextInput(
+            name="checkpoint_path",
+            display_name="Checkpoint File",
+            info="Optional JSONL file. Each batch is recorded after Qdrant acknowledges the upsert, "
+            "and recorded chunks are skipped on the next run.",
+            required=False,
+            advanced=True,
+        ),
+        BoolInput(
+            name="adaptive_batching",
+            display_name="Adaptive Batching",
+            info="Tune embedding and upsert batch sizes at runtime from observed latency, "
+            "errors and payload size. Batch Size is used as the starting point.",
+            value=False,
+            advanced=True,
+        ),
+        IntInput(
+            name="min_batch_size",
+            display_name="Min Batch Size",
+            value=8,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_batch_size",
+            display_name="Max Batch Size",
+            value=512,
+            advanced=True,
+        ),
+        FloatInput(
+            name="target_batch_seconds",
+            display_name="Target Seconds per Batch",
+            value=2.0,
+            advanced=True,
+        ),
+        FloatInput(
+            name="max_upsert_mb",
+            display_name="Max Upsert Payload (MB)",
+            value=8.0,
+            advanced=True,
+        ),
     ]
 
     outputs = [
         Output(
             display_name="Indexed Data",
             name="dataframe",
-            method="index_data",
+            method="aindex_data",
         ),
         Output(
             display_name="Retrieved Data",
             name="retrieved_dataframe",
-            method="retrieve_data",
+            method="aretrieve_data",
         ),
     ]
 
     def index_data(self) -> DataFrame:
+        """Sync entry point for direct callers; runs aindex_data on its own event loop."""
+        return asyncio.run(self.aindex_data())
+
+    async def aindex_data(self) -> DataFrame:
+        """Embed and upsert the chunks without blocking the event loop."""
         if not self.data_inputs:
             return DataFrame([])
-        
+
         if not isinstance(self.data_inputs, DataFrame):
             raise TypeError("Input must be a DataFrame")
 
@@ -79,14 +340,14 @@ class QdrantHTTPOnly(Component):
 
         documents = self.data_inputs.to_lc_documents()
 
-        # ✅ CORRECT API FOR THIS LANGCHAIN VERSION
-        Qdrant.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            url=self.qdrant_url,
-            collection_name=self.collection_name,
-            batch_size=self.batch_size,
-        )
+        if self.checkpoint_path:
+            pending, record_batch = self._checkpoint_plan(documents)
+            await self._aindex_batches(pending, on_batch=record_batch)
+            self.status = f"{self.status}, skipped {len(documents) - len(pending)} already checkpointed"
+            return self.data_inputs
+
+        # Batch Size is used as-is unless adaptive batching is on
+        await self._aindex_batches([(str(uuid.uuid4()), None, doc) for doc in documents])
 
         # Pass-through
         return self.data_inputs
@@ -98,8 +359,50 @@ class QdrantHTTPOnly(Component):
         if not self.embeddings:
             raise ValueError("Embeddings are required for retrieval")
 
+        if not self.coalesce_requests:
+            return self._results_to_dataframe(self._similarity_search())
+
+        flight = _single_flight()
+        results = flight.do(self._coalesce_key(), self._similarity_search)
+        self.status = self._coalesce_status(flight)
+        return self._results_to_dataframe(results)
+
+    async def aretrieve_data(self) -> DataFrame:
+        """Async twin of retrieve_data, so concurrent chat sessions search in parallel."""
+        if not self.search_query:
+            return DataFrame([])
+
+        if not self.embeddings:
+            raise ValueError("Embeddings are required for retrieval")
+
+        if not self.coalesce_requests:
+            return self._results_to_dataframe(await self._asimilarity_search())
+
+        flight = _single_flight()
+        results = await flight.ado(self._coalesce_key(), self._asimilarity_search)
+        self.status = self._coalesce_status(flight)
+        return self._results_to_dataframe(results)
+
+    def _coalesce_key(self) -> tuple:
+        # Only whitespace is normalized; embedding models are case-sensitive, so
+        # folding case would hand callers results for another query
+        query = " ".join(self.search_query.split())
+        model = getattr(self.embeddings, "model", None)
+        return (self.qdrant_url, self.collection_name, query, self.k, model)
+
+    @staticmethod
+    def _coalesce_status(flight: _SingleFlight) -> str:
+        stats = flight.stats()
+        return (
+            f"Searches: {stats['requests']}, executed: {stats['executed']}, "
+            f"coalesced: {stats['coalesced']} ({stats['coalescing_ratio']:.0%})"
+        )
+
+    def _similarity_search(self) -> list:
+        from langchain_community.vectorstores import Qdrant
+
         # Create Qdrant client for HTTP connection
-        client = QdrantClient(url=self.qdrant_url)
+        client = self._qdrant_client()
 
         # Connect to existing Qdrant collection using the client
         # The Qdrant constructor accepts: client, collection_name, and embeddings (plural)
@@ -110,11 +413,35 @@ class QdrantHTTPOnly(Component):
         )
 
         # Perform similarity search
-        results = qdrant.similarity_search(
+        return qdrant.similarity_search(
             query=self.search_query,
             k=self.k,
         )
 
+    async def _asimilarity_search(self) -> list:
+        from langchain_core.documents import Document
+
+        client = await self._async_qdrant_client()
+
+        # Uses embeddings.aembed_query, which never blocks the event loop
+        vector = await self.embeddings.aembed_query(self.search_query)
+        response = await client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            limit=self.k,
+            with_payload=True,
+        )
+
+        # Same payload layout the LangChain Qdrant wrapper writes and reads
+        return [
+            Document(
+                page_content=(point.payload or {}).get("page_content", ""),
+                metadata=(point.payload or {}).get("metadata") or {},
+            )
+            for point in response.points
+        ]
+
+    def _results_to_dataframe(self, results) -> DataFrame:
         # Convert results to DataFrame format
         data_items = []
         for doc in results:
@@ -125,4 +452,222 @@ class QdrantHTTPOnly(Component):
                 )
             )
 
-        return DataFrame(data_items)
\ No newline at end of file
+        return DataFrame(data_items)
+
+    def _checkpoint_plan(self, documents) -> tuple[list, object]:
+        """Chunks still to upsert, plus a callback recording each stored batch.
+
+        Point IDs are derived from (bucket, key, page, chunk ordinal, content hash),
+        so a batch that is replayed after a crash overwrites its points instead of
+        duplicating them, and different chunks never share an ID. Finished pages
+        are recorded as (bucket, key, etag, page), so a PDF replaced in S3 is
+        loaded again.
+        """
+        done_ids = self._load_checkpoint_ids()
+
+        pending = []
+        ordinals: dict[tuple, int] = {}
+        for doc in documents:
+            page_key = (
+                doc.metadata.get("bucket"),
+                doc.metadata.get("key"),
+                doc.metadata.get("etag"),
+                doc.metadata.get("page"),
+            )
+            ordinal = ordinals.get(page_key, 0)
+            ordinals[page_key] = ordinal + 1
+
+            # Inputs without S3 metadata all share one page key; the hash keeps them apart
+            digest = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+            point_id = str(
+                uuid.uuid5(
+                    uuid.NAMESPACE_URL,
+                    f"{self.collection_name}/{page_key[0]}/{page_key[1]}#{page_key[3]}:{ordinal}:{digest}",
+                )
+            )
+            if point_id not in done_ids:
+                pending.append((point_id, page_key, doc))
+
+        # A page is complete once the batch holding its last pending chunk is stored
+        last_position = {page_key: i for i, (_, page_key, _) in enumerate(pending)}
+
+        # Pages whose chunks were all stored earlier (e.g. unchanged text in a
+        # replaced PDF) are recorded now, or the loader would keep sending them
+        already_stored = [
+            list(page_key)
+            for page_key in ordinals
+            if page_key[1] is not None and page_key not in last_position
+        ]
+        if already_stored:
+            self._append_checkpoint({"collection": self.collection_name, "ids": [], "pages": already_stored})
+
+        def record_batch(batch_number: int, start: int, batch: list) -> None:
+            end = start + len(batch)
+            finished_pages = dict.fromkeys(
+                page_key
+                for _, page_key, _ in batch
+                if page_key[1] is not None and last_position[page_key] < end
+            )
+            self._append_checkpoint(
+                {
+                    "collection": self.collection_name,
+                    "batch": batch_number,
+                    "ids": [point_id for point_id, _, _ in batch],
+                    "pages": [list(page_key) for page_key in finished_pages],
+                }
+            )
+
+        return pending, record_batch
+
+    def _make_sizer(self, max_bytes=None) -> _AdaptiveBatchSizer:
+        if not self.adaptive_batching:
+            return _AdaptiveBatchSizer(self.batch_size, self.batch_size, self.batch_size)
+        return _AdaptiveBatchSizer(
+            self.batch_size,
+            self.min_batch_size,
+            self.max_batch_size,
+            target_seconds=self.target_batch_seconds,
+            max_bytes=max_bytes,
+        )
+
+    async def _aattempt(self, sizer: _AdaptiveBatchSizer, count: int, fn, nbytes: int = 0):
+        """Run one timed batch call. Returns None when the batch should be retried smaller."""
+        started = time.perf_counter()
+        try:
+            result = await fn()
+        except Exception as e:
+            if not sizer.record_error():
+                raise
+            self.log(f"Batch of {count} failed ({e!r}); retrying with batch size {sizer.size}")
+            return None
+        sizer.record_success(count, time.perf_counter() - started, nbytes)
+        return result
+
+    def _to_points(self, chunk: list, vectors) -> "list[PointStruct]":
+        from qdrant_client.models import PointStruct
+
+        return [
+            PointStruct(
+                id=point_id,
+                vector=vector,
+                payload={"page_content": doc.page_content, "metadata": doc.metadata},
+            )
+            for (point_id, _, doc), vector in zip(chunk, vectors)
+        ]
+
+    @staticmethod
+    def _payload_bytes(points: "list[PointStruct]") -> int:
+        return sum(len(json.dumps(p.payload, default=str)) + 4 * len(p.vector) for p in points)
+
+    async def _aindex_batches(self, pending: list, on_batch=None) -> None:
+        """Embed and upsert ``(point_id, page_key, document)`` items.
+
+        Embedding and upsert run as separate stages with their own batch size, so
+        a slow Ollama host and a payload-limited Qdrant are tuned independently.
+        ``on_batch(batch_number, start, batch)`` runs after each acknowledged upsert.
+        """
+        client = await self._async_qdrant_client()
+        embed_sizer = self._make_sizer()
+        upsert_sizer = self._make_sizer(max_bytes=int(self.max_upsert_mb * 1024 * 1024))
+
+        ready: list[PointStruct] = []
+        embedded = 0
+        stored = 0
+        batch_number = 0
+        while stored < len(pending):
+            while embedded < len(pending) and len(ready) < upsert_sizer.size:
+                chunk = pending[embedded : embedded + embed_sizer.size]
+                texts = [doc.page_content for _, _, doc in chunk]
+                vectors = await self._aattempt(
+                    embed_sizer, len(chunk), lambda: self.embeddings.aembed_documents(texts)
+                )
+                if vectors is None:
+                    continue
+
+                if not embedded and not stored:
+                    await self._aensure_collection(client, len(vectors[0]))
+                ready.extend(self._to_points(chunk, vectors))
+                embedded += len(chunk)
+
+            points = ready[: upsert_sizer.size]
+            acknowledged = await self._aattempt(
+                upsert_sizer,
+                len(points),
+                lambda: client.upsert(collection_name=self.collection_name, points=points, wait=True),
+                self._payload_bytes(points),
+            )
+            if acknowledged is None:
+                continue
+
+            if on_batch is not None:
+                on_batch(batch_number, stored, pending[stored : stored + len(points)])
+            ready = ready[len(points) :]
+            stored += len(points)
+            batch_number += 1
+
+        self.status = (
+            f"Indexed {stored} chunks in {batch_number} batches "
+            f"(embed batch size {embed_sizer.size}, upsert batch size {upsert_sizer.size})"
+        )
+
+    def _qdrant_client(self) -> "QdrantClient":
+        # Single construction point, so a harness can substitute a shared client
+        return _shared_client(self.qdrant_url)
+
+    async def _async_qdrant_client(self) -> "AsyncQdrantClient":
+        # Single construction point, so a harness can substitute a shared client
+        return await _shared_async_client(self.qdrant_url)
+
+    async def _aensure_collection(self, client: "AsyncQdrantClient", dimension: int) -> None:
+        from qdrant_client.models import Distance, VectorParams
+
+        # Same vector layout and distance as Qdrant.from_documents, so retrieval is unchanged
+        if not await client.collection_exists(self.collection_name):
+            await client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=dimension, distance=Distance.COSINE),
+            )
+            return
+
+        # Checked before the first upsert, so a model switch is not retried as a batch error
+        info = await client.get_collection(self.collection_name)
+        params = info.config.params.vectors
+        if not isinstance(params, VectorParams):
+            raise ValueError(
+                f"Collection '{self.collection_name}' uses named vectors; "
+                "this component writes a single unnamed vector"
+            )
+        if params.size != dimension:
+            raise ValueError(
+                f"Collection '{self.collection_name}' holds {params.size}-dimensional vectors, "
+                f"but the embedding model produces {dimension}. "
+                "Use the model the collection was built with, or a new collection."
+            )
+        if params.distance != Distance.COSINE:
+            raise ValueError(
+                f"Collection '{self.collection_name}' uses {Distance(params.distance).value} distance; "
+                "this component requires Cosine"
+            )
+
+    def _load_checkpoint_ids(self) -> set[str]:
+        done_ids: set[str] = set()
+        if not os.path.exists(self.checkpoint_path):
+            return done_ids
+
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be truncated if the previous run died mid-write
+                    continue
+                if record.get("collection") == self.collection_name:
+                    done_ids.update(record.get("ids", []))
+
+        return done_ids
+
+    def _append_checkpoint(self, record: dict) -> None:
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
\ No newline at end of file
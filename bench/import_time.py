@@ -0,0 +1,108 @@
+"""Import-time benchmark for the custom component modules.
+
+Each component file is loaded in a fresh interpreter, the way a Langflow worker
+loads it to render the component palette. The langflow modules a file imports
+are loaded first and excluded from the timing, since the server has them
+already, so the number is the component's own import cost. With ``--ref`` the
+same files are also measured at another git revision for comparison.
+
+    python bench/import_time.py
+    python bench/import_time.py --ref <commit-before-lazy-imports> --runs 7
+"""
+
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import importlib, importlib.util, json, sys, time
+for name in {preload!r}:
+    importlib.import_module(name)
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("component_under_test", {path!r})
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(json.dumps(time.perf_counter() - started))
+"""
+
+
+def component_files() -> list[Path]:
+    return sorted(
+        path
+        for folder in ("Ingest", "Retrival")
+        for path in (REPO_ROOT / folder).glob("*.py")
+    )
+
+
+def langflow_imports(source: str) -> list[str]:
+    """Top-level langflow modules imported by a component file."""
+    names = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.split(".")[0] == "langflow":
+            names.append(node.module)
+        elif isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names if alias.name.split(".")[0] == "langflow")
+    return names
+
+
+def time_import(path: Path, source: str, runs: int) -> float:
+    """Median seconds to execute the module, each run in a new interpreter."""
+    child = CHILD.format(preload=langflow_imports(source), path=str(path))
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", child], capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def source_at(ref: str, relative: str) -> str | None:
+    result = subprocess.run(
+        ["git", "show", f"{ref}:{relative}"], cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    return result.stdout if result.returncode == 0 else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ref", help="Git revision to compare against")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per file; the median is reported")
+    args = parser.parse_args()
+
+    header = f"{'component':<42}{'current ms':>12}"
+    if args.ref:
+        header += f"{args.ref[:12] + ' ms':>16}{'saved ms':>12}"
+    print(header)
+
+    # Files missing at --ref are left out of the comparison totals
+    total_current = compared_current = total_ref = 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in component_files():
+            relative = path.relative_to(REPO_ROOT).as_posix()
+            current = time_import(path, path.read_text(encoding="utf-8"), args.runs)
+            total_current += current
+            line = f"{relative:<42}{current * 1000:>12.1f}"
+
+            old_source = source_at(args.ref, relative) if args.ref else None
+            if old_source is not None:
+                old_path = Path(tmp) / relative.replace("/", "_")
+                old_path.write_text(old_source, encoding="utf-8")
+                previous = time_import(old_path, old_source, args.runs)
+                total_ref += previous
+                compared_current += current
+                line += f"{previous * 1000:>16.1f}{(previous - current) * 1000:>12.1f}"
+            print(line)
+
+    total = f"{'total':<42}{total_current * 1000:>12.1f}"
+    if args.ref:
+        total += f"{total_ref * 1000:>16.1f}{(total_ref - compared_current) * 1000:>12.1f}"
+    print(total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Load-test and recall harness for the Retrival flow's vector search.
+
+Replays a query set against ``QdrantHTTPOnly.aretrieve_data`` on one event
+loop, at most ``--concurrency`` searches in flight, and reports the latency
+distribution, throughput and recall@k against an exact brute-force NumPy search
+over the same vectors. ``--mode threads`` drives the sync ``retrieve_data`` from
+a thread pool instead. ``LocalVectorIndex`` has no async output, so in asyncio
+mode its ``retrieve_data`` runs in worker threads, as Langflow runs sync outputs.
+
+Everything runs on local stand-ins: a deterministic hashing embedder with an
+optional simulated latency instead of Ollama, and an in-memory Qdrant (or the
+local mmap index) instead of a server. Pass ``--backend qdrant --qdrant-url``
+to measure a real Qdrant, where HNSW makes the recall column meaningful.
+
+    python bench/retrieval_load_test.py --docs 20000 --queries 500 --concurrency 16
+    python bench/retrieval_load_test.py --mode threads --concurrency 16
+    python bench/retrieval_load_test.py --backend local --ann-threshold 1 --n-probe 1,4,16,64
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langflow.schema.data import Data
+from langflow.schema.dataframe import DataFrame
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_module(relative_path: str, module_name: str):
+    spec = importlib.util.spec_from_file_location(module_name, REPO_ROOT / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-words embedder standing in for Ollama."""
+
+    def __init__(self, dim: int, latency_ms: float = 0.0):
+        self.dim = dim
+        self.latency = latency_ms / 1000
+        self.model = f"hashing-{dim}"
+
+    def embed_array(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                h = zlib.crc32(token.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h >> 31 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        # Waits like an async HTTP client would, without holding a thread
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.embed_array(texts).tolist()
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+def synthetic_corpus(n_docs: int, seed: int) -> list[str]:
+    """Zipf-distributed documents over a fixed vocabulary."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [" ".join(rng.choices(vocabulary, weights, k=40)) for _ in range(n_docs)]
+
+
+def sample_queries(docs: list[str], n_queries: int, seed: int) -> list[str]:
+    """Each query is a handful of words from one document of the corpus."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        words = rng.choice(docs).split()
+        queries.append(" ".join(rng.sample(words, min(8, len(words)))))
+    return queries
+
+
+def read_lines(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def exact_top_k(doc_vectors: np.ndarray, query_vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = query_vectors @ doc_vectors.T
+    k = min(k, doc_vectors.shape[0])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def point_batches(docs: list[str], doc_vectors: np.ndarray, size: int = 256):
+    for start in range(0, len(docs), size):
+        yield [
+            PointStruct(
+                id=i,
+                vector=doc_vectors[i].tolist(),
+                payload={"page_content": docs[i], "metadata": {"doc_id": i}},
+            )
+            for i in range(start, min(start + size, len(docs)))
+        ]
+
+
+def fill_collection(client: QdrantClient, args, docs, doc_vectors) -> None:
+    if client.collection_exists(args.collection):
+        client.delete_collection(args.collection)
+    client.create_collection(
+        collection_name=args.collection,
+        vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE),
+    )
+    for points in point_batches(docs, doc_vectors):
+        client.upsert(collection_name=args.collection, points=points, wait=True)
+
+
+async def afill_collection(client: AsyncQdrantClient, args, docs, doc_vectors) -> None:
+    await client.create_collection(
+        collection_name=args.collection,
+        vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE),
+    )
+    for points in point_batches(docs, doc_vectors):
+        await client.upsert(collection_name=args.collection, points=points, wait=True)
+
+
+def qdrant_factory(args, embeddings, docs, doc_vectors):
+    module = load_module("Retrival/qdrant_component.py", "retrival_qdrant_component")
+
+    client = async_client = None
+    if args.backend == "qdrant":
+        # The component's own per-event-loop AsyncQdrantClient serves asyncio mode
+        client = QdrantClient(url=args.qdrant_url)
+        fill_collection(client, args, docs, doc_vectors)
+    elif args.mode == "threads":
+        client = QdrantClient(location=":memory:")
+        fill_collection(client, args, docs, doc_vectors)
+    else:
+        # An in-memory AsyncQdrantClient has its own store and is not tied to a loop
+        async_client = AsyncQdrantClient(location=":memory:")
+        asyncio.run(afill_collection(async_client, args, docs, doc_vectors))
+
+    class SharedClientQdrant(module.QdrantHTTPOnly):
+        def _qdrant_client(self):
+            return client
+
+        async def _async_qdrant_client(self):
+            if async_client is None:
+                return await super()._async_qdrant_client()
+            return async_client
+
+    def make_component(query: str, _setting):
+        component = SharedClientQdrant()
+        component.set(
+            embeddings=embeddings,
+            qdrant_url=args.qdrant_url,
+            collection_name=args.collection,
+            search_query=query,
+            k=args.k,
+            coalesce_requests=not args.no_coalesce,
+        )
+        return component
+
+    return make_component, [None], module._single_flight
+
+
+def local_factory(args, embeddings, docs, _doc_vectors):
+    module = load_module("Retrival/local_vector_component.py", "retrival_local_vector_component")
+    index_path = tempfile.mkdtemp(prefix="local_vector_index_")
+
+    indexer = module.LocalVectorIndex()
+    indexer.set(
+        data_inputs=DataFrame([Data(text=text, data={"doc_id": i}) for i, text in enumerate(docs)]),
+        embeddings=embeddings,
+        index_path=index_path,
+        collection_name=args.collection,
+        batch_size=1024,
+        ann_threshold=args.ann_threshold,
+    )
+    indexer.index_data()
+
+    def make_component(query: str, n_probe):
+        component = module.LocalVectorIndex()
+        component.set(
+            embeddings=embeddings,
+            index_path=index_path,
+            collection_name=args.collection,
+            search_query=query,
+            k=args.k,
+            n_probe=n_probe,
+        )
+        return component
+
+    return make_component, [int(n) for n in args.n_probe.split(",")], None
+
+
+def retrieved_ids(retrieved) -> list[int]:
+    return [int(doc_id) for doc_id in retrieved["doc_id"]] if len(retrieved) else []
+
+
+def run_threads(make_component, setting, queries: list[str], concurrency: int):
+    def one(query: str):
+        component = make_component(query, setting)
+        started = time.perf_counter()
+        retrieved = component.retrieve_data()
+        return time.perf_counter() - started, retrieved_ids(retrieved)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, queries))
+    wall = time.perf_counter() - started
+    return wall, [latency for latency, _ in outcomes], [ids for _, ids in outcomes]
+
+
+async def run_asyncio(make_component, setting, queries: list[str], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query: str):
+        async with semaphore:
+            component = make_component(query, setting)
+            started = time.perf_counter()
+            if hasattr(type(component), "aretrieve_data"):
+                retrieved = await component.aretrieve_data()
+            else:
+                retrieved = await asyncio.to_thread(component.retrieve_data)
+            return time.perf_counter() - started, retrieved_ids(retrieved)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(query) for query in queries))
+    wall = time.perf_counter() - started
+    return wall, [latency for latency, _ in outcomes], [ids for _, ids in outcomes]
+
+
+def run(mode: str, make_component, setting, queries: list[str], concurrency: int):
+    if mode == "threads":
+        return run_threads(make_component, setting, queries, concurrency)
+    return asyncio.run(run_asyncio(make_component, setting, queries, concurrency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["qdrant-memory", "qdrant", "local"], default="qdrant-memory")
+    parser.add_argument("--mode", choices=["asyncio", "threads"], default="asyncio")
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--collection", default="load_test")
+    parser.add_argument("--corpus", help="Text file with one document per line (default: synthetic)")
+    parser.add_argument("--query-file", help="Text file with one query per line (default: sampled from the corpus)")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the query set this many times, shuffled")
+    parser.add_argument("--concurrency", type=int, default=8, help="Searches in flight at once")
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Simulated Ollama latency per call")
+    parser.add_argument("--no-coalesce", action="store_true", help="Disable single-flight coalescing")
+    parser.add_argument("--ann-threshold", type=int, default=0, help="local backend: IVF build threshold (0 = exact)")
+    parser.add_argument("--n-probe", default="16", help="local backend: comma-separated IVF probe counts to sweep")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per setting")
+    args = parser.parse_args()
+
+    docs = read_lines(args.corpus) if args.corpus else synthetic_corpus(args.docs, args.seed)
+    queries = read_lines(args.query_file) if args.query_file else sample_queries(docs, args.queries, args.seed)
+    queries = queries * args.repeat
+    random.Random(args.seed).shuffle(queries)
+
+    embeddings = HashingEmbeddings(args.dim, args.embed_latency_ms)
+    doc_vectors = embeddings.embed_array(docs)
+    expected = exact_top_k(doc_vectors, embeddings.embed_array(queries), args.k)
+
+    factory = local_factory if args.backend == "local" else qdrant_factory
+    make_component, settings, single_flight = factory(args, embeddings, docs, doc_vectors)
+
+    for setting in settings:
+        wall, latencies, retrieved = run(args.mode, make_component, setting, queries, args.concurrency)
+        recall = np.mean(
+            [len(set(ids) & set(truth.tolist())) / len(truth) for ids, truth in zip(retrieved, expected)]
+        )
+        p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+        report = {
+            "backend": args.backend,
+            "mode": args.mode,
+            "n_probe": setting,
+            "docs": len(docs),
+            "queries": len(queries),
+            "concurrency": args.concurrency,
+            "k": args.k,
+            "qps": len(queries) / wall,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            f"recall@{args.k}": float(recall),
+        }
+        if single_flight is not None:
+            report.update(single_flight().stats())
+
+        if args.json:
+            print(json.dumps(report))
+        else:
+            print(
+                "  ".join(
+                    f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                    for key, value in report.items()
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()